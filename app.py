@@ -1,18 +1,29 @@
 import os
 import re
+import atexit
 import uuid
 import json
+import hashlib
 import csv
 import sqlite3
 import shutil
+import tempfile
+import time
 import zipfile
+import queue
+import threading
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import List
 from io import BytesIO
 
-from fastapi import FastAPI, HTTPException, Form
-from fastapi.responses import HTMLResponse, FileResponse, Response
-from pyembroidery import read, write
+from fastapi import FastAPI, HTTPException, Form, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response, StreamingResponse
+import numpy as np
+from pyembroidery import read, write, EmbThread
+from pyembroidery.EmbThread import build_unique_palette
+from pyembroidery.EmbThreadPec import get_thread_set
 from PIL import Image, ImageDraw, ImageFont
 
 
@@ -47,6 +58,8 @@ MAX_BLOCKS = 20
 
 # Clean preview: treat big stitch moves as "jump" and do NOT draw them
 JUMP_DISTANCE_THRESHOLD = float(os.environ.get("JNB_JUMP_THRESHOLD", "45.0"))
+# Squared once at load so the hot path compares squared distances (no sqrt).
+JUMP_THRESH_SQ = JUMP_DISTANCE_THRESHOLD * JUMP_DISTANCE_THRESHOLD
 
 os.makedirs(MASTER_DIR, exist_ok=True)
 os.makedirs(GENERATED_DIR, exist_ok=True)
@@ -60,15 +73,39 @@ app = FastAPI(title="jnbvisualizer")
 # ============================================================
 # DATABASE
 # ============================================================
+# One process-global connection in WAL mode (autocommit). Connecting and
+# fsync-heavy commits per request were the main cost of /save-proof; WAL +
+# synchronous=NORMAL moves that off the hot path. Writers serialize on
+# _db_lock since the connection is shared between threads.
+_db_con = None
+_db_lock = threading.Lock()
+
+
 def db():
-    con = sqlite3.connect(DB_PATH)
-    con.row_factory = sqlite3.Row
-    return con
+    global _db_con
+    if _db_con is None:
+        _db_con = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+        _db_con.row_factory = sqlite3.Row
+        _db_con.execute("PRAGMA journal_mode=WAL")
+        _db_con.execute("PRAGMA synchronous=NORMAL")
+    return _db_con
+
+
+def snapshot_db_to(dest_path: str):
+    # In WAL mode recent commits (and on a fresh instance even the schema)
+    # live in proofs.db-wal until a checkpoint, so copying the main file
+    # alone ships an unusable database. backup() writes a self-contained
+    # snapshot that includes everything.
+    with _db_lock:
+        dst = sqlite3.connect(dest_path)
+        try:
+            db().backup(dst)
+        finally:
+            dst.close()
 
 
 def init_db():
-    con = db()
-    con.execute(
+    db().execute(
         """
         CREATE TABLE IF NOT EXISTS proofs (
             proof_id TEXT PRIMARY KEY,
@@ -81,8 +118,6 @@ def init_db():
         )
         """
     )
-    con.commit()
-    con.close()
 
 
 init_db()
@@ -95,16 +130,28 @@ def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+@lru_cache(maxsize=1)
+def _list_pes(mtime: float) -> List[str]:
+    with os.scandir(MASTER_DIR) as it:
+        return sorted(e.name for e in it if e.is_file() and e.name.lower().endswith(".pes"))
+
+
 def list_pes_files() -> List[str]:
+    # Adding/removing a file bumps the directory mtime, which invalidates
+    # the cached listing; everything else is a cache hit.
     if not os.path.isdir(MASTER_DIR):
         return []
-    return sorted([f for f in os.listdir(MASTER_DIR) if f.lower().endswith(".pes")])
+    return _list_pes(os.path.getmtime(MASTER_DIR))
+
+
+_SAFE_SUB = re.compile(r"[^a-z0-9_-]+")
+_SAFE_COLLAPSE = re.compile(r"_+")
 
 
 def safe_tag(s: str, max_len: int = 28) -> str:
     s = (s or "").strip().lower()
-    s = re.sub(r"[^a-z0-9_-]+", "_", s)
-    s = re.sub(r"_+", "_", s).strip("_")
+    s = _SAFE_SUB.sub("_", s)
+    s = _SAFE_COLLAPSE.sub("_", s).strip("_")
     return (s or "client")[:max_len]
 
 
@@ -117,11 +164,19 @@ def new_proof_id() -> str:
     return "JNB-" + uuid.uuid4().hex[:8].upper()
 
 
+def _make_etag(*parts) -> str:
+    key = "|".join(str(p) for p in parts)
+    return '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+
+_HEX6 = re.compile(r"[0-9a-fA-F]{6}")
+
+
 def hex_to_rgb(hex_color: str):
     h = (hex_color or "").strip().lstrip("#")
     if len(h) == 3:
         h = "".join([c * 2 for c in h])
-    if len(h) != 6 or not re.fullmatch(r"[0-9a-fA-F]{6}", h):
+    if len(h) != 6 or not _HEX6.fullmatch(h):
         raise HTTPException(status_code=400, detail=f"Invalid color: {hex_color}")
     return (int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16))
 
@@ -130,7 +185,7 @@ def hex_to_rgb_int(hex_color: str) -> int:
     h = (hex_color or "").strip().lstrip("#")
     if len(h) == 3:
         h = "".join([c * 2 for c in h])
-    if len(h) != 6 or not re.fullmatch(r"[0-9a-fA-F]{6}", h):
+    if len(h) != 6 or not _HEX6.fullmatch(h):
         raise HTTPException(status_code=400, detail=f"Invalid color: {hex_color}")
     return int(h, 16)  # 0xRRGGBB
 
@@ -160,20 +215,57 @@ def ensure_csv_header():
         w.writerow(["created_utc", "proof_id", "design_file", "client_tag", "bg_hex", "colors_csv", "generated_pes_filename"])
 
 
+# Long-lived line-buffered handle: one flush per row instead of an
+# open/close (and close-time sync) per row. Only the writer thread appends.
+_csv_fh = None
+_csv_writer = None
+
+
+def _csv():
+    global _csv_fh, _csv_writer
+    if _csv_writer is None:
+        ensure_csv_header()
+        _csv_fh = open(LOG_CSV_PATH, "a", newline="", encoding="utf-8", buffering=1)
+        _csv_writer = csv.writer(_csv_fh)
+        atexit.register(_csv_fh.close)
+    return _csv_writer
+
+
 def append_csv_log(created_utc, proof_id, design_file, client_tag, bg_hex, colors_csv, generated_path):
-    ensure_csv_header()
-    with open(LOG_CSV_PATH, "a", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow([created_utc, proof_id, design_file, client_tag, bg_hex, colors_csv, os.path.basename(generated_path)])
+    _csv().writerow([created_utc, proof_id, design_file, client_tag, bg_hex, colors_csv, os.path.basename(generated_path)])
 
 
 def write_json_snapshot(payload: dict, proof_id: str) -> str:
+    # Write-then-rename so a crash can never leave a truncated snapshot;
+    # os.replace is atomic on POSIX and needs no explicit fsync here.
     snap_path = os.path.join(BACKUP_DIR, f"{proof_id}.json")
-    with open(snap_path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
+    tmp_path = snap_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, snap_path)
     return snap_path
 
 
+# Proof bookkeeping (CSV log, JSON snapshot, mirror copies) runs on a
+# background thread so /save-proof returns as soon as the SQLite row —
+# the source of truth — is in. Jobs are plain callables.
+_writeq: queue.Queue = queue.Queue()
+
+
+def _writer_loop():
+    while True:
+        job = _writeq.get()
+        try:
+            job()
+        except Exception:
+            pass
+        finally:
+            _writeq.task_done()
+
+
+threading.Thread(target=_writer_loop, daemon=True, name="proof-writer").start()
+
+
 def mirror_file_if_enabled(path: str):
     if not MIRROR_BACKUP_DIR:
         return
@@ -183,6 +275,32 @@ def mirror_file_if_enabled(path: str):
         pass
 
 
+# The DB and CSV are append-only, so mirroring them on every save just
+# re-copies the same bytes. Mirror in batches; only the per-proof JSON
+# snapshot (new, tiny) is mirrored immediately. Runs on the writer thread
+# only, so plain module state is fine.
+_MIRROR_EVERY_N = 10
+_MIRROR_EVERY_SECS = 30.0
+_saves_since_mirror = 0
+_last_mirror_ts = 0.0
+
+
+def _mirror_bulk_if_due():
+    global _saves_since_mirror, _last_mirror_ts
+    _saves_since_mirror += 1
+    now = time.monotonic()
+    if _saves_since_mirror < _MIRROR_EVERY_N and now - _last_mirror_ts < _MIRROR_EVERY_SECS:
+        return
+    _saves_since_mirror = 0
+    _last_mirror_ts = now
+    if MIRROR_BACKUP_DIR:
+        try:
+            snapshot_db_to(os.path.join(MIRROR_BACKUP_DIR, os.path.basename(DB_PATH)))
+        except Exception:
+            pass
+    mirror_file_if_enabled(LOG_CSV_PATH)
+
+
 # ============================================================
 # OPTIONAL SLUG LOCK ( /w/{slug} ) using design_map.json
 # ============================================================
@@ -199,73 +317,75 @@ def load_design_map() -> dict:
 # ============================================================
 # PES -> BLOCKS -> RENDER (CLEAN: NO JUMPS/TRAVEL)
 # ============================================================
+@lru_cache(maxsize=64)
+def _read_cached(path: str, mtime: float):
+    return read(path)
+
+
+def read_pattern(path: str):
+    # Masters are read-only repo files, so keying on (path, mtime) makes the
+    # cache hit on every preview/save after the first parse.
+    return _read_cached(path, os.path.getmtime(path))
+
+
 def pattern_to_blocks_clean(pattern):
-    blocks = []
-    current = []
-    last = None
-
-    for x, y, cmd in pattern.stitches:
-        # 0=STITCH, 1=JUMP, 2=TRIM, 3=STOP, 4=END, 5=COLOR_CHANGE
-        if cmd == 0:  # STITCH
-            if last is not None:
-                x0, y0 = last
-                dx = x - x0
-                dy = y - y0
-                dist = (dx * dx + dy * dy) ** 0.5
-
-                # Treat long moves as jumps (do NOT draw)
-                if dist > JUMP_DISTANCE_THRESHOLD:
-                    last = (x, y)
-                    continue
-
-                current.append((x0, y0, x, y))
-            last = (x, y)
-
-        elif cmd == 5:  # COLOR_CHANGE
-            if current:
-                blocks.append(current)
-                current = []
-            last = None
+    # Vectorized: one numpy pass over all stitches instead of a Python loop.
+    # Each block is a list of polylines ((K, 2) float32 point arrays), so the
+    # renderer can draw a whole connected run with a single draw.line call.
+    arr = np.asarray(pattern.stitches, dtype=np.int32)
+    if arr.ndim != 2 or len(arr) < 2:
+        return []
 
-        else:
-            last = None
+    xy = arr[:, :2]
+    cmd = arr[:, 2]
+
+    # Segment i connects stitch i to stitch i+1. Draw it only when both
+    # endpoints are STITCH (cmd 0) and the move is not jump-length.
+    # 0=STITCH, 1=JUMP, 2=TRIM, 3=STOP, 4=END, 5=COLOR_CHANGE
+    d = np.diff(xy.astype(np.int64), axis=0)
+    d2 = d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1]
+    valid = (d2 <= JUMP_THRESH_SQ) & (cmd[:-1] == 0) & (cmd[1:] == 0)
+
+    xyf = xy.astype(np.float32)
 
-    if current:
-        blocks.append(current)
+    # Split into blocks at COLOR_CHANGE stitches (segment space = stitch space - 1).
+    cuts = np.where(cmd == 5)[0]
+    bounds = np.concatenate([[0], cuts, [len(valid)]])
+
+    blocks = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        idx = np.where(valid[start:end])[0]
+        if not len(idx):
+            continue
+        # Consecutive valid segments share an endpoint, so each run of
+        # consecutive indices is one connected polyline; jumps break runs.
+        splits = np.where(np.diff(idx) != 1)[0] + 1
+        block = []
+        for run in np.split(idx, splits):
+            s0 = start + run[0]
+            s1 = start + run[-1]
+            block.append(xyf[s0:s1 + 2])
+        blocks.append(block)
 
     return blocks
 
 
 def normalize_blocks(blocks, padding=40, canvas=900):
-    pts = []
-    for b in blocks:
-        for x1, y1, x2, y2 in b:
-            pts.append((x1, y1))
-            pts.append((x2, y2))
-
-    if not pts:
+    if not blocks:
         return blocks, canvas
 
-    xs = [p[0] for p in pts]
-    ys = [p[1] for p in pts]
-    minx, maxx = min(xs), max(xs)
-    miny, maxy = min(ys), max(ys)
-    w = (maxx - minx) or 1
-    h = (maxy - miny) or 1
-
-    scale = (canvas - 2 * padding) / max(w, h)
-
-    out = []
-    for b in blocks:
-        nb = []
-        for x1, y1, x2, y2 in b:
-            nx1 = (x1 - minx) * scale + padding
-            ny1 = (y1 - miny) * scale + padding
-            nx2 = (x2 - minx) * scale + padding
-            ny2 = (y2 - miny) * scale + padding
-            nb.append((nx1, ny1, nx2, ny2))
-        out.append(nb)
+    # One numpy pass for the bounding box, then a broadcast affine transform
+    # per polyline — no Python-level per-point work.
+    all_pts = np.concatenate([line for b in blocks for line in b], axis=0)
+    mins = all_pts.min(axis=0)
+    span = np.maximum(all_pts.max(axis=0) - mins, 1)
 
+    scale = (canvas - 2 * padding) / span.max()
+
+    out = [
+        [((line - mins) * scale + padding).astype(np.float32) for line in b]
+        for b in blocks
+    ]
     return out, canvas
 
 
@@ -280,34 +400,79 @@ def extract_thread_colors(pattern) -> List[str]:
     return colors[:MAX_BLOCKS]
 
 
-def get_block_count(pattern) -> int:
-    blocks = pattern_to_blocks_clean(pattern)
-    return min(len(blocks), MAX_BLOCKS)
+@lru_cache(maxsize=32)
+def _design_cache(path: str, mtime: float):
+    # Everything about a design that does not depend on the chosen colors:
+    # normalized blocks, canvas size, master thread colors, block count.
+    pattern = _read_cached(path, mtime)
+    blocks = pattern_to_blocks_clean(pattern)[:MAX_BLOCKS]
+    blocks, canvas = normalize_blocks(blocks, padding=40, canvas=900)
+    return blocks, canvas, extract_thread_colors(pattern), len(blocks)
+
 
+def design_render_data(path: str):
+    return _design_cache(path, os.path.getmtime(path))
 
-def render_preview_png(design_path: str, bg_hex: str, colors_hex: List[str]) -> bytes:
-    pattern = read(design_path)
-    blocks = pattern_to_blocks_clean(pattern)
-    blocks = blocks[:MAX_BLOCKS]
-    blocks, canvas = normalize_blocks(blocks, padding=40, canvas=900)
 
-    fallback = extract_thread_colors(pattern)
+def _rasterize_block(canvas, block, value):
+    # Vectorized DDA over every segment of the block at once: sample each
+    # segment at max(|dx|, |dy|) + 1 points, flatten all samples into one
+    # index pair, and stamp a 2x2 footprint (the old width=2 stroke).
+    p0 = np.concatenate([line[:-1] for line in block], axis=0)
+    p1 = np.concatenate([line[1:] for line in block], axis=0)
+    d = p1 - p0
 
-    img = Image.new("RGB", (canvas, canvas), hex_to_rgb(bg_hex))
-    draw = ImageDraw.Draw(img)
+    n = np.ceil(np.maximum(np.abs(d[:, 0]), np.abs(d[:, 1]))).astype(np.int64) + 1
+    total = int(n.sum())
+    if not total:
+        return
+
+    seg = np.repeat(np.arange(len(n)), n)
+    local = np.arange(total, dtype=np.float32) - np.repeat(np.cumsum(n) - n, n)
+    t = local / np.maximum(n[seg] - 1, 1)
 
-    line_width = 2
+    xi = np.rint(p0[seg, 0] + t * d[seg, 0]).astype(np.intp)
+    yi = np.rint(p0[seg, 1] + t * d[seg, 1]).astype(np.intp)
 
+    h, w = canvas.shape
+    for dy in (0, 1):
+        for dx in (0, 1):
+            canvas[np.clip(yi + dy, 0, h - 1), np.clip(xi + dx, 0, w - 1)] = value
+
+
+@lru_cache(maxsize=32)
+def _render_index_image(path: str, mtime: float):
+    # Rasterize the stitch geometry once per design into a palette image
+    # where pixel value 0 is background and i+1 is block i. Recoloring is
+    # then just a palette swap — no redrawing per request.
+    blocks, canvas, _, _ = _design_cache(path, mtime)
+
+    index = np.zeros((canvas, canvas), dtype=np.uint8)
     for i, block in enumerate(blocks):
+        _rasterize_block(index, block, i + 1)
+
+    return index.tobytes(), (canvas, canvas)
+
+
+def render_preview_png(design_path: str, bg_hex: str, colors_hex: List[str]) -> bytes:
+    mtime = os.path.getmtime(design_path)
+    raw, size = _render_index_image(design_path, mtime)
+    _, canvas, fallback, block_count = _design_cache(design_path, mtime)
+
+    palette = list(hex_to_rgb(bg_hex))
+    for i in range(block_count):
         if i < len(colors_hex):
             col = hex_to_rgb(colors_hex[i])
         elif i < len(fallback):
             col = hex_to_rgb(fallback[i])
         else:
             col = (0, 0, 0)
+        palette.extend(col)
 
-        for x1, y1, x2, y2 in block:
-            draw.line((x1, y1, x2, y2), fill=col, width=line_width)
+    img = Image.frombytes("P", size, raw)
+    img.putpalette(palette)
+    img = img.convert("RGB")
+    draw = ImageDraw.Draw(img)
 
     # watermark
     try:
@@ -318,24 +483,114 @@ def render_preview_png(design_path: str, bg_hex: str, colors_hex: List[str]) ->
     draw.text((10, canvas - 20), "jnbvisualizer proof (preview only)", fill=(255, 255, 255), font=font)
 
     buf = BytesIO()
-    img.save(buf, format="PNG")
+    # Previews are throwaway; trade a few KB of size for a much faster
+    # DEFLATE pass (default compress_level=6 dominates the render time).
+    img.save(buf, format="PNG", compress_level=1, optimize=False)
     return buf.getvalue()
 
 
-def generate_recolored_pes(master_path: str, colors_hex: List[str], proof_id: str, client_tag: str, design_file: str) -> str:
-    pattern = read(master_path)
+# PES versions whose thread colors come solely from the PEC color table.
+# From v5 on, the header carries a truecolor threadlist that readers prefer,
+# so patching only the PEC bytes would leave those colors unchanged.
+_PES_PEC_COLOR_VERSIONS = frozenset(
+    [b"#PES0001", b"#PES0020", b"#PES0022", b"#PES0030", b"#PES0040"]
+)
+
+
+def _patch_pes_colors(master_path: str, out_path: str, colors_int: List[int]) -> bool:
+    """Recolor a PES by patching its PEC color-index bytes in a file copy.
+
+    The stitches are unchanged, so there is no need to re-serialize them:
+    thread colors for pre-v5 PES masters live entirely in the PEC color table
+    (one palette-index byte per color block, at pec_start + 49). Runs of
+    equal index bytes read back as a single visible block (duplicates become
+    stops), so visible block k maps onto run k. Returns False when the file
+    does not look like we expect; the caller falls back to a full write().
+    """
+    with open(master_path, "rb") as f:
+        data = bytearray(f.read())
+
+    if len(data) < 12 or bytes(data[:8]) not in _PES_PEC_COLOR_VERSIONS:
+        return False
+    pec_pos = int.from_bytes(data[8:12], "little")
+    if data[pec_pos:pec_pos + 3] != b"LA:":
+        return False
+
+    color_changes = data[pec_pos + 48]
+    if color_changes == 0xFF:  # 0xFF means no colors at all
+        return False
+    count = color_changes + 1
+    table = pec_pos + 49
+    if table + count > len(data):
+        return False
+
+    thread_set = get_thread_set()
+    max_value = len(thread_set)
+    old = bytes(data[table:table + count])
+
+    # One thread per visible run: the requested color where provided, the
+    # master's original thread otherwise. Runs with the same color share a
+    # single EmbThread so they claim one palette slot, like the writer.
+    runs = []  # (first byte offset in table, run length)
+    run_threads = []
+    thread_by_color = {}
+    prev = None
+    for j in range(count):
+        if old[j] != prev:
+            prev = old[j]
+            runs.append([j, 0])
+            block = len(runs) - 1
+            if block < len(colors_int):
+                color = colors_int[block]
+            else:
+                original = thread_set[old[j] % max_value]
+                if original is None:
+                    return False
+                color = original.color
+            if color not in thread_by_color:
+                thread_by_color[color] = EmbThread(color)
+            run_threads.append(thread_by_color[color])
+        runs[-1][1] += 1
+
+    # Map colors to indices the same way the writer does: each distinct
+    # color claims a distinct palette slot, so two different requested
+    # colors can never quantize onto the same index and merge adjacent
+    # blocks into one (readers treat a change to the same index as a STOP).
+    indexes = build_unique_palette(get_thread_set(), run_threads)
+    if any(i is None for i in indexes):
+        return False
+
+    for (start, length), idx in zip(runs, indexes):
+        data[table + start:table + start + length] = bytes([idx]) * length
+
+    with open(out_path, "wb") as f:
+        f.write(data)
+    return True
+
+
+def generate_recolored_pes(master_path: str, colors_int: List[int], proof_id: str, client_tag: str, design_file: str) -> str:
+    pattern = read_pattern(master_path)
 
     if not pattern.threadlist:
         raise HTTPException(status_code=500, detail="Master PES has no thread list.")
 
-    n = min(len(pattern.threadlist), len(colors_hex))
-    for i in range(n):
-        pattern.threadlist[i].color = hex_to_rgb_int(colors_hex[i])
-
     out_name = f"{os.path.splitext(design_file)[0]}__{safe_tag(client_tag)}__{proof_id}.pes"
     out_path = os.path.join(GENERATED_DIR, out_name)
 
-    write(pattern, out_path)
+    try:
+        patched = _patch_pes_colors(master_path, out_path, colors_int)
+    except Exception:
+        patched = False
+
+    if not patched:
+        # Copy before recoloring so we never mutate the cached master pattern.
+        pattern = pattern.copy()
+        pattern.threadlist = [EmbThread(t) for t in pattern.threadlist]
+        n = min(len(pattern.threadlist), len(colors_int))
+        for i, c in enumerate(colors_int[:n]):
+            pattern.threadlist[i].color = c
+        write(pattern, out_path)
+
     return out_path
 
 
@@ -354,12 +609,18 @@ def home():
 
 
 @app.get("/design-info")
-def design_info(design: str):
+async def design_info(design: str, request: Request):
     design_path = validate_design_file(design)
-    pattern = read(design_path)
-    colors = extract_thread_colors(pattern)
-    blocks = get_block_count(pattern)
-    return {"design": design, "colors": colors, "block_count": blocks}
+
+    etag = _make_etag(design, os.path.getmtime(design_path))
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+
+    _, _, colors, block_count = await run_in_threadpool(design_render_data, design_path)
+    return JSONResponse(
+        {"design": design, "colors": colors, "block_count": block_count},
+        headers={"ETag": etag, "Cache-Control": "public, max-age=3600"},
+    )
 
 
 @app.get("/w/{slug}", response_class=HTMLResponse)
@@ -407,6 +668,18 @@ def widget(design: str = "", lock: int = 0):
             f"<div class='locked'>Design locked</div>"
         )
 
+    html = (
+        _WIDGET_SKELETON
+        .replace("__DESIGN_HTML__", design_html)
+        .replace("__SELECTED__", selected)
+    )
+    return HTMLResponse(content=html)
+
+
+# Everything in the widget page except the design selector and the selected
+# default is invariant, so the skeleton is rendered once at import time and
+# each request only substitutes those two slots.
+def _build_widget_skeleton() -> str:
     color_inputs = []
     for i in range(1, MAX_BLOCKS + 1):
         color_inputs.append(
@@ -421,7 +694,7 @@ def widget(design: str = "", lock: int = 0):
             """
         )
 
-    html = f"""
+    return f"""
 <!doctype html>
 <html>
 <head>
@@ -453,7 +726,7 @@ def widget(design: str = "", lock: int = 0):
     <h3>Preview Thread Colors</h3>
     <div class="small">This is a proof image only. Original design files are never downloadable to customers.</div>
 
-    {design_html}
+    __DESIGN_HTML__
 
     <label>Your name / tag</label>
     <input id="clientTag" type="text" placeholder="ex: maniz" />
@@ -495,7 +768,7 @@ function getColors() {{
 
 function getDesign() {{
   const el = document.getElementById("design");
-  return el ? el.value : "{selected}";
+  return el ? el.value : "__SELECTED__";
 }}
 
 function setNA(i, isNA) {{
@@ -544,8 +817,10 @@ function refresh() {{
             + "&bg=" + encodeURIComponent(bg)
             + "&colors=" + encodeURIComponent(colors);
 
+  // No cache-buster: the URL params key the browser cache and the server
+  // answers 304 via ETag when nothing changed.
   const img = document.getElementById("preview");
-  img.src = url + "&t=" + Date.now();
+  img.src = url;
 
   const dbg = document.getElementById("debug");
   if (dbg) dbg.textContent = "Preview URL: " + img.src;
@@ -598,21 +873,31 @@ loadDesignColors().then(refresh);
 </body>
 </html>
 """
-    return HTMLResponse(content=html)
+
+
+_WIDGET_SKELETON = _build_widget_skeleton()
 
 
 @app.get("/preview.png")
-def preview_png(design: str, bg: str, colors: str):
+async def preview_png(design: str, bg: str, colors: str, request: Request):
     design_path = validate_design_file(design)
     _ = hex_to_rgb_int(bg)
     colors_list = parse_colors_csv(colors)
 
-    png_bytes = render_preview_png(design_path, bg, colors_list)
-    return Response(content=png_bytes, media_type="image/png")
+    etag = _make_etag(design, os.path.getmtime(design_path), bg, colors)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+
+    png_bytes = await run_in_threadpool(render_preview_png, design_path, bg, colors_list)
+    return Response(
+        content=png_bytes,
+        media_type="image/png",
+        headers={"ETag": etag, "Cache-Control": "public, max-age=3600"},
+    )
 
 
 @app.post("/save-proof")
-def save_proof(
+async def save_proof(
     design_file: str = Form(...),
     client_tag: str = Form(...),
     bg_hex: str = Form(...),
@@ -623,21 +908,23 @@ def save_proof(
 
     _ = hex_to_rgb_int(bg_hex)
     colors_list = parse_colors_csv(colors_csv)
+    colors_int = [hex_to_rgb_int(c) for c in colors_list]
 
     proof_id = new_proof_id()
     created = utc_now_iso()
 
-    out_path = generate_recolored_pes(master_path, colors_list, proof_id, client_tag_clean, design_file)
-
-    con = db()
-    con.execute(
-        "INSERT INTO proofs (proof_id, design_file, client_tag, bg_hex, colors_csv, created_utc, generated_pes_path) VALUES (?,?,?,?,?,?,?)",
-        (proof_id, design_file, client_tag_clean, bg_hex, ",".join(colors_list), created, out_path),
+    out_path = await run_in_threadpool(
+        generate_recolored_pes, master_path, colors_int, proof_id, client_tag_clean, design_file
     )
-    con.commit()
-    con.close()
 
-    append_csv_log(created, proof_id, design_file, client_tag_clean, bg_hex, ",".join(colors_list), out_path)
+    def _insert():
+        with _db_lock:
+            db().execute(
+                "INSERT INTO proofs (proof_id, design_file, client_tag, bg_hex, colors_csv, created_utc, generated_pes_path) VALUES (?,?,?,?,?,?,?)",
+                (proof_id, design_file, client_tag_clean, bg_hex, ",".join(colors_list), created, out_path),
+            )
+
+    await run_in_threadpool(_insert)
 
     snap_payload = {
         "created_utc": created,
@@ -648,11 +935,14 @@ def save_proof(
         "colors": colors_list,
         "generated_pes_filename": os.path.basename(out_path),
     }
-    snap_path = write_json_snapshot(snap_payload, proof_id)
 
-    mirror_file_if_enabled(DB_PATH)
-    mirror_file_if_enabled(LOG_CSV_PATH)
-    mirror_file_if_enabled(snap_path)
+    def _bookkeeping():
+        append_csv_log(created, proof_id, design_file, client_tag_clean, bg_hex, ",".join(colors_list), out_path)
+        snap_path = write_json_snapshot(snap_payload, proof_id)
+        mirror_file_if_enabled(snap_path)
+        _mirror_bulk_if_due()
+
+    _writeq.put(_bookkeeping)
 
     return {"proof_id": proof_id}
 
@@ -660,11 +950,9 @@ def save_proof(
 @app.get("/admin", response_class=HTMLResponse)
 def admin(pw: str):
     require_admin(pw)
-    con = db()
-    rows = con.execute(
+    rows = db().execute(
         "SELECT proof_id, design_file, client_tag, created_utc FROM proofs ORDER BY created_utc DESC LIMIT 200"
     ).fetchall()
-    con.close()
 
     items = []
     for r in rows:
@@ -689,11 +977,9 @@ def admin(pw: str):
 @app.get("/admin/download/{proof_id}")
 def admin_download(proof_id: str, pw: str):
     require_admin(pw)
-    con = db()
-    r = con.execute(
+    r = db().execute(
         "SELECT generated_pes_path FROM proofs WHERE proof_id=?", (proof_id.strip(),)
     ).fetchone()
-    con.close()
 
     if not r:
         raise HTTPException(status_code=404, detail="Proof not found.")
@@ -705,35 +991,97 @@ def admin_download(proof_id: str, pw: str):
     return FileResponse(path, media_type="application/octet-stream", filename=os.path.basename(path))
 
 
-@app.get("/admin/backup.zip")
-def admin_backup_zip(pw: str):
-    require_admin(pw)
+class _ZipStream:
+    """Write-only sink for ZipFile whose output is consumed as a chunk stream.
+
+    The bounded queue gives backpressure: the zipping thread stalls when the
+    client is slow instead of buffering the whole archive in memory. If the
+    consumer goes away mid-download, the aborted flag unblocks write() so
+    the zipping thread unwinds instead of parking on a full queue forever.
+    """
+
+    def __init__(self, maxsize=16):
+        self.chunks: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.aborted = False
+
+    def write(self, data):
+        chunk = bytes(data)
+        while chunk:
+            if self.aborted:
+                raise BrokenPipeError("backup download aborted by client")
+            try:
+                self.chunks.put(chunk, timeout=1.0)
+                break
+            except queue.Full:
+                continue
+        return len(chunk)
+
+    def flush(self):
+        pass
 
-    mem = BytesIO()
-    with zipfile.ZipFile(mem, "w", compression=zipfile.ZIP_DEFLATED) as z:
-        if os.path.exists(DB_PATH):
-            z.write(DB_PATH, arcname="proofs.db")
-        if os.path.exists(LOG_CSV_PATH):
-            z.write(LOG_CSV_PATH, arcname="proofs_log.csv")
+    def close(self):
+        while not self.aborted:
+            try:
+                self.chunks.put(None, timeout=1.0)
+                return
+            except queue.Full:
+                continue
 
-        if os.path.isdir(BACKUP_DIR):
-            for name in os.listdir(BACKUP_DIR):
-                if name.lower().endswith(".json"):
-                    z.write(os.path.join(BACKUP_DIR, name), arcname=f"backups/{name}")
+    def __iter__(self):
+        try:
+            while True:
+                chunk = self.chunks.get()
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            self.aborted = True
 
-        if os.path.isdir(GENERATED_DIR):
-            for name in os.listdir(GENERATED_DIR):
-                if name.lower().endswith(".pes"):
-                    z.write(os.path.join(GENERATED_DIR, name), arcname=f"generated/{name}")
 
-        if os.path.exists(DESIGN_MAP_PATH):
-            z.write(DESIGN_MAP_PATH, arcname="design_map.json")
+@app.get("/admin/backup.zip")
+async def admin_backup_zip(pw: str):
+    require_admin(pw)
+
+    stream = _ZipStream()
+
+    def _produce():
+        try:
+            with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as z:
+                fd, tmp_db = tempfile.mkstemp(prefix="proofs_backup_", suffix=".db")
+                os.close(fd)
+                try:
+                    snapshot_db_to(tmp_db)
+                    z.write(tmp_db, arcname="proofs.db")
+                finally:
+                    os.remove(tmp_db)
+                if os.path.exists(LOG_CSV_PATH):
+                    z.write(LOG_CSV_PATH, arcname="proofs_log.csv")
+
+                if os.path.isdir(BACKUP_DIR):
+                    with os.scandir(BACKUP_DIR) as it:
+                        for e in it:
+                            if e.is_file() and e.name.lower().endswith(".json"):
+                                z.write(e.path, arcname=f"backups/{e.name}")
+
+                if os.path.isdir(GENERATED_DIR):
+                    with os.scandir(GENERATED_DIR) as it:
+                        for e in it:
+                            if e.is_file() and e.name.lower().endswith(".pes"):
+                                z.write(e.path, arcname=f"generated/{e.name}")
+
+                if os.path.exists(DESIGN_MAP_PATH):
+                    z.write(DESIGN_MAP_PATH, arcname="design_map.json")
+        except BrokenPipeError:
+            pass  # client went away mid-download
+        finally:
+            stream.close()
+
+    threading.Thread(target=_produce, daemon=True, name="backup-zip").start()
 
-    mem.seek(0)
     stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"JNB_BACKUP_{stamp}.zip"
-    return Response(
-        mem.read(),
+    return StreamingResponse(
+        iter(stream),
         media_type="application/zip",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )